@@ -1,17 +1,80 @@
 import os
+import atexit
 import json
 import csv
-from flask import Flask, request, jsonify, render_template, url_for, redirect
-from models import Game, Difficulty, Piece, PieceColor, Pawn, Rook, Knight, Bishop, Queen, King
+import io
+import hashlib
+import threading
+from operator import itemgetter
+from flask import Flask, Response, request, render_template, url_for, redirect
+from flask.json.provider import DefaultJSONProvider
+from models import Board, Game, GameStatus, Difficulty, Piece, PieceColor, Pawn, Rook, Knight, Bishop, Queen, King
+
+try:
+    import orjson  # Optional C-accelerated JSON encoder/decoder
+except ImportError:
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that uses orjson for request.get_json() and any jsonify() calls."""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 
 app = Flask(__name__)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
 
 # --- File Configuration ---
 GAME_STATE_FILE = "data/games.json"
 LEADERBOARD_FILE = "data/leaderboard.csv"
+LEADERBOARD_JOURNAL_FILE = "data/leaderboard.journal"
+LEADERBOARD_COMPACTING_FILE = "data/leaderboard.journal.compacting"
+LEADERBOARD_FIELDS = ("player_name", "wins", "losses", "draws")
+
+
+class GameHolder:
+    """Holds the current in-memory game and the lock that serializes requests touching it."""
+
+    __slots__ = ("game", "lock", "state_source", "state_body", "state_etag")
+
+    def __init__(self, game: Game):
+        self.game = game
+        self.lock = threading.Lock()
+        # Encoded /state body and its ETag, reused while the game's cached state dict is unchanged
+        self.state_source = None
+        self.state_body = None
+        self.state_etag = None
+
+    def state_snapshot(self, state: dict):
+        """Returns the encoded body and ETag for the given state, re-encoding only when it changed."""
+        if state is not self.state_source:
+            self.state_body = encode_json(state)
+            self.state_etag = hashlib.blake2b(self.state_body, digest_size=8).hexdigest()
+            self.state_source = state
+        return self.state_body, self.state_etag
+
+    def swap(self, game: Game):
+        """Atomically replaces the current game with a new one."""
+        with self.lock:
+            self.game = game
+
 
 # In-memory game object, which will be synced with the file system.
-game = Game()
+game_holder = GameHolder(Game())
+
+# In-memory leaderboard keyed by player name, loaded lazily from LEADERBOARD_FILE.
+# The dirty flag marks journaled results not yet compacted into the CSV file, and
+# leaderboard_sorted caches the records ordered by wins until the next update.
+leaderboard = None
+leaderboard_dirty = False
+leaderboard_sorted = None
+leaderboard_lock = threading.Lock()
 
 # --- Mapping for Deserialization ---
 # Maps character symbols back to their corresponding Piece classes and colors.
@@ -30,61 +93,227 @@ PIECE_MAP = {
     "K": (King, PieceColor.WHITE),
 }
 
+# The same mapping as a flat table indexed by ord(symbol), so loading a board
+# does a list index per square instead of a dict lookup.
+PIECE_TABLE = [None] * 128
+for _symbol, _entry in PIECE_MAP.items():
+    PIECE_TABLE[ord(_symbol)] = _entry
+
+# --- Mapping for Algebraic Notation ---
+# Precomputed (column, row) tuple for each of the 64 squares, e.g. "e4" -> (4, 3).
+ALGEBRAIC_TO_TUPLE = {f"{file}{rank}": (col, rank - 1) for col, file in enumerate("abcdefgh") for rank in range(1, 9)}
+
 # --- Helper Functions for File I/O and Serialization ---
 
 
-def get_current_state_json():
-    """Gets the current game state and formats it for a JSON response."""
-    if game.game_status == "not_started":
+def get_current_state_json(game):
+    """Gets the state of the given game and formats it for a JSON response."""
+    if game.game_status == GameStatus.NOT_STARTED:
         return {"error": "Game not started. Please POST to /start first."}
 
     state = game.get_game_state()
     return state
 
 
+def encode_json(data):
+    """Encodes data as compact JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+def json_response(data, status=200):
+    """Builds a JSON response with a pre-encoded body, skipping jsonify's extra work."""
+    return Response(encode_json(data), status=status, mimetype="application/json")
+
+
+def write_json_file(path, data):
+    """Writes data to a compact JSON file in one call, using orjson when it is installed."""
+    if orjson is not None:
+        raw = orjson.dumps(data)
+    else:
+        raw = json.dumps(data, separators=(",", ":")).encode()
+    with open(path, "wb") as f:
+        f.write(raw)
+
+
+def read_json_file(path):
+    """Reads and parses a JSON file, using orjson when it is installed."""
+    with open(path, "rb") as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def record_result(records, winner_name, loser_name):
+    """Adds one win and one loss to the given leaderboard records."""
+    # Add new players if they aren't on the leaderboard yet
+    for name in (winner_name, loser_name):
+        if name not in records:
+            records[name] = {"player_name": name, "wins": 0, "losses": 0, "draws": 0}
+    records[winner_name]["wins"] += 1
+    records[loser_name]["losses"] += 1
+
+
+def read_leaderboard_journal(path):
+    """Returns the (winner, loser) rows of a leaderboard journal and whether any had to be skipped."""
+    try:
+        with open(path, mode="r", newline="") as f:
+            journal = f.read()
+    except FileNotFoundError:
+        return [], False  # Nothing journaled since the last compaction
+
+    results = []
+    damaged = False
+    if journal and not journal.endswith("\n"):
+        # Every append ends with a newline, so text after the last one is a torn write
+        journal, _, torn = journal.rpartition("\n")
+        app.logger.warning("Skipping torn last line in %s: %r", path, torn)
+        damaged = True
+    reader = csv.reader(io.StringIO(journal))
+    for row in reader:
+        if not row:
+            continue  # Blank line
+        if len(row) != 2 or not all(row):
+            app.logger.warning("Skipping malformed row %d in %s: %r", reader.line_num, path, row)
+            damaged = True
+            continue
+        results.append(row)
+    return results, damaged
+
+
+def get_leaderboard_records():
+    """Returns the in-memory leaderboard, reading leaderboard.csv and its journal on first use.
+
+    Callers must hold leaderboard_lock.
+    """
+    global leaderboard, leaderboard_dirty
+    if leaderboard is None:
+        # Build the records locally so a load that fails part way never leaves a partial cache behind
+        records = {}
+        try:
+            with open(LEADERBOARD_FILE, mode="r", newline="") as f:
+                reader = csv.reader(f)
+                header = next(reader, None) or LEADERBOARD_FIELDS
+                # Read columns through the header so a file with another column order still loads correctly
+                try:
+                    name_col, wins_col, losses_col, draws_col = (header.index(field) for field in LEADERBOARD_FIELDS)
+                except ValueError:
+                    raise ValueError(f"{LEADERBOARD_FILE} header {header} lacks one of {LEADERBOARD_FIELDS}") from None
+                for row in reader:
+                    if not row:
+                        continue  # Blank line
+                    try:
+                        # Convert numbers to int once so reads never have to
+                        name = row[name_col]
+                        records[name] = {
+                            "player_name": name,
+                            "wins": int(row[wins_col]),
+                            "losses": int(row[losses_col]),
+                            "draws": int(row[draws_col]),
+                        }
+                    except (IndexError, ValueError):
+                        app.logger.warning("Skipping malformed row %d in %s: %r", reader.line_num, LEADERBOARD_FILE, row)
+        except FileNotFoundError:
+            pass  # No games have been recorded yet
+
+        # Replay results journaled since the CSV was last compacted. A journal left behind by an
+        # interrupted compaction is already part of the snapshot if the snapshot was written after it.
+        journal_files = [LEADERBOARD_COMPACTING_FILE, LEADERBOARD_JOURNAL_FILE]
+        try:
+            compacting_mtime = os.stat(LEADERBOARD_COMPACTING_FILE).st_mtime_ns
+        except FileNotFoundError:
+            journal_files.remove(LEADERBOARD_COMPACTING_FILE)
+        else:
+            try:
+                snapshot_mtime = os.stat(LEADERBOARD_FILE).st_mtime_ns
+            except FileNotFoundError:
+                snapshot_mtime = -1
+            if snapshot_mtime > compacting_mtime:
+                os.remove(LEADERBOARD_COMPACTING_FILE)
+                journal_files.remove(LEADERBOARD_COMPACTING_FILE)
+
+        results = []
+        journal_damaged = False
+        for path in journal_files:
+            file_results, file_damaged = read_leaderboard_journal(path)
+            results += file_results
+            journal_damaged = journal_damaged or file_damaged
+        for winner_name, loser_name in results:
+            record_result(records, winner_name, loser_name)
+
+        leaderboard = records
+        if results or journal_damaged:
+            leaderboard_dirty = True
+        if journal_damaged:
+            # Compact now so later appends never land on the end of a torn line
+            flush_leaderboard()
+    return leaderboard
+
+
+def flush_leaderboard():
+    """Compacts the journaled results into the leaderboard CSV file if there are any.
+
+    Callers must hold leaderboard_lock.
+    """
+    global leaderboard_dirty
+    if not leaderboard_dirty:
+        return
+
+    # Format every row into one buffer and write it with a single call; the csv
+    # writer is kept for correct quoting of player names.
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(LEADERBOARD_FIELDS)
+    writer.writerows((r["player_name"], r["wins"], r["losses"], r["draws"]) for r in leaderboard.values())
+
+    # Move the journal aside before writing the snapshot that includes it, and drop it only once
+    # the snapshot is in place; a crash in between leaves a file get_leaderboard_records can resolve
+    try:
+        os.replace(LEADERBOARD_JOURNAL_FILE, LEADERBOARD_COMPACTING_FILE)
+    except FileNotFoundError:
+        pass  # Nothing new journaled; a leftover compacting file is already in memory
+    temp_file = LEADERBOARD_FILE + ".tmp"
+    with open(temp_file, mode="wb") as f:
+        f.write(buffer.getvalue().encode())
+    os.replace(temp_file, LEADERBOARD_FILE)
+    try:
+        os.remove(LEADERBOARD_COMPACTING_FILE)
+    except FileNotFoundError:
+        pass
+    leaderboard_dirty = False
+
+
 def update_leaderboard(winner_name, loser_name):
-    """Reads, updates, and writes the leaderboard CSV file."""
-    records = []
-    player_found = {"winner": False, "loser": False}
-
-    # Read existing data
-    if os.path.exists(LEADERBOARD_FILE):
-        with open(LEADERBOARD_FILE, mode="r", newline="") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if row["player_name"] == winner_name:
-                    row["wins"] = int(row["wins"]) + 1
-                    player_found["winner"] = True
-                elif row["player_name"] == loser_name:
-                    row["losses"] = int(row["losses"]) + 1
-                    player_found["loser"] = True
-                records.append(row)
-
-    # Add new players if they weren't in the file
-    if not player_found["winner"]:
-        records.append({"player_name": winner_name, "wins": 1, "losses": 0, "draws": 0})
-    if not player_found["loser"]:
-        records.append({"player_name": loser_name, "wins": 0, "losses": 1, "draws": 0})
-
-    # Write all data back to the file
-    with open(LEADERBOARD_FILE, mode="w", newline="") as f:
-        fieldnames = ["player_name", "wins", "losses", "draws"]
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(records)
+    """Records a result in memory and appends it to the leaderboard journal."""
+    global leaderboard_dirty, leaderboard_sorted
+    with leaderboard_lock:
+        record_result(get_leaderboard_records(), winner_name, loser_name)
+        leaderboard_dirty = True
+        leaderboard_sorted = None
+
+        # One short append instead of rewriting the whole CSV on every checkmate
+        line = io.StringIO()
+        csv.writer(line).writerow((winner_name, loser_name))
+        with open(LEADERBOARD_JOURNAL_FILE, mode="ab") as f:
+            f.write(line.getvalue().encode())
+
+
+@atexit.register
+def flush_leaderboard_on_exit():
+    """Compacts any journaled leaderboard results when the process shuts down."""
+    with leaderboard_lock:
+        flush_leaderboard()
 
 
 def algebraic_to_tuple(pos: str) -> tuple[int, int]:
     """
-    Converts algebraic chess notation (e.g., 'e4') to a tuple (row, column).
-    Returns (row, col) with 1-based indexing: 'a1' -> (1, 1), 'h8' -> (8, 8)
+    Converts algebraic chess notation (e.g., 'e4') to a tuple (column, row).
+    Returns (column, row) with 0-based indexing: 'a1' -> (0, 0), 'h8' -> (7, 7)
     """
-    if len(pos) != 2 or pos[0] not in "abcdefgh" or pos[1] not in "12345678":
-        raise ValueError(f"Invalid chess position: {pos}")
-
-    col = ord(pos[0]) - ord("a")  # 'a' → 0, 'h' → 7
-    row = int(pos[1]) - 1  # '1' → 0, '8' → 7
-    return (col, row)
+    try:
+        return ALGEBRAIC_TO_TUPLE[pos]
+    except (KeyError, TypeError):  # TypeError for unhashable input such as a JSON list
+        raise ValueError(f"Invalid chess position: {pos}") from None
 
 
 # --- API Endpoints ---
@@ -93,7 +322,8 @@ def algebraic_to_tuple(pos: str) -> tuple[int, int]:
 @app.route("/")
 def index():
     """Renders the main page."""
-    if game.game_status != "active":
+    game = game_holder.game
+    if game.game_status != GameStatus.ACTIVE:
         return render_template("starting_page.html")
     else:
         return redirect(url_for("play"))
@@ -102,7 +332,8 @@ def index():
 @app.route("/play")
 def play():
     """Renders the game board page."""
-    if game.game_status == "not_started":
+    game = game_holder.game
+    if game.game_status == GameStatus.NOT_STARTED:
         return redirect(url_for("index"))
     return render_template("chess.html")
 
@@ -110,150 +341,156 @@ def play():
 @app.route("/start", methods=["POST"])
 def start_game():
     """Starts a new game, requires player names."""
-    global game
     data = request.get_json()
     if not data or "player_white" not in data or "player_black" not in data:
-        return jsonify({"error": "Player names 'player_white' and 'player_black' must be provided."}), 400
+        return json_response({"error": "Player names 'player_white' and 'player_black' must be provided."}, 400)
 
     difficulty_str = data.get("difficulty", "medium")
     try:
         difficulty = Difficulty(difficulty_str.lower())
     except ValueError:
-        return jsonify({"error": "Invalid difficulty. Choose from 'easy', 'medium', or 'hard'."}), 400
+        return json_response({"error": "Invalid difficulty. Choose from 'easy', 'medium', or 'hard'."}, 400)
 
     game = Game()  # Create a fresh game instance
     game.start_game(difficulty, data["player_white"], data["player_black"])
+    # Build the response before publishing the game, so a concurrent /move cannot change it mid-read
+    state = get_current_state_json(game)
+    game_holder.swap(game)
 
-    return jsonify(
+    return json_response(
         {
             "message": f"New game started for {game.player_white} (White) vs. {game.player_black} (Black).",
-            "state": get_current_state_json(),
+            "state": state,
         }
-    ), 200
+    )
 
 
 @app.route("/end", methods=["GET"])
 def end_game():
     """Ends the current game and resets the game object."""
-    game.end_game()
-    return jsonify({"message": "Game ended successfully. You can start a new game."}), 200
+    with game_holder.lock:
+        game = game_holder.game
+        game.end_game()
+        return json_response({"message": "Game ended successfully. You can start a new game."})
 
 
 @app.route("/state", methods=["GET"])
 def get_state():
-    """Returns the current state of the game."""
-    state_data = get_current_state_json()
-    if "error" in state_data:
-        return jsonify(state_data), 404
-    return jsonify(state_data), 200
+    """Returns the current state of the game, or 304 if the client's ETag still matches."""
+    with game_holder.lock:
+        game = game_holder.game
+        state_data = get_current_state_json(game)
+        if "error" in state_data:
+            return json_response(state_data, 404)
+        body, etag = game_holder.state_snapshot(state_data)
+
+    if etag in request.if_none_match:
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype="application/json")
+    response.set_etag(etag)
+    return response
 
 
 @app.route("/move", methods=["POST"])
 def make_move():
     """Accepts a move, validates it, and updates the board."""
-    if game.game_status != "active":
-        return jsonify({"error": f"Game not active (status: {game.game_status}). Please start a new game."}), 400
+    with game_holder.lock:
+        game = game_holder.game
+        if game.game_status != GameStatus.ACTIVE:
+            return json_response({"error": f"Game not active (status: {game.game_status}). Please start a new game."}, 400)
 
-    data = request.get_json()
-    if not data or "from" not in data or "to" not in data:
-        return jsonify({"error": "Move requires 'from' and 'to' positions in algebraic notation (e.g., 'e2')."}), 400
+        data = request.get_json()
+        if not data or "from" not in data or "to" not in data:
+            return json_response({"error": "Move requires 'from' and 'to' positions in algebraic notation (e.g., 'e2')."}, 400)
 
-    try:
-        start_pos = algebraic_to_tuple(data["from"])
-        end_pos = algebraic_to_tuple(data["to"])
-    except ValueError:
-        return jsonify({"error": "Invalid algebraic notation. Use format like 'a2'."}), 400
+        try:
+            start_pos = algebraic_to_tuple(data["from"])
+            end_pos = algebraic_to_tuple(data["to"])
+        except ValueError:
+            return json_response({"error": "Invalid algebraic notation. Use format like 'a2'."}, 400)
 
-    success, message = game.make_move(start_pos, end_pos)
+        success, message = game.make_move(start_pos, end_pos)
 
-    if success:
-        # Check if the game ended to update the leaderboard
-        if game.game_status == "checkmate":
-            winner = game.player_white if game.winner == PieceColor.WHITE else game.player_black
-            loser = game.player_black if game.winner == PieceColor.WHITE else game.player_white
-            update_leaderboard(winner, loser)
-            message = f"Checkmate! {winner} wins."
+        if success:
+            # Check if the game ended to update the leaderboard
+            if game.game_status == GameStatus.CHECKMATE:
+                winner = game.player_white if game.winner == PieceColor.WHITE else game.player_black
+                loser = game.player_black if game.winner == PieceColor.WHITE else game.player_white
+                update_leaderboard(winner, loser)
+                message = f"Checkmate! {winner} wins."
 
-        response = {"message": message, "state": get_current_state_json()}
-        return jsonify(response), 200
-    else:
-        return jsonify({"error": message}), 400
+            response = {"message": message, "state": get_current_state_json(game)}
+            return json_response(response)
+        else:
+            return json_response({"error": message}, 400)
 
 
 @app.route("/leaderboard", methods=["GET"])
 def get_leaderboard():
-    """Returns leaderboard data from leaderboard.csv."""
-    if not os.path.exists(LEADERBOARD_FILE):
-        return jsonify([]), 200  # Return empty list if file doesn't exist
-
-    leaderboard = []
-    with open(LEADERBOARD_FILE, mode="r", newline="") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            # Convert numbers to int for proper JSON typing
-            row["wins"] = int(row["wins"])
-            row["losses"] = int(row["losses"])
-            row["draws"] = int(row["draws"])
-            leaderboard.append(row)
-
-    # Sort by wins, descending
-    leaderboard.sort(key=lambda x: x["wins"], reverse=True)
-    return jsonify(leaderboard), 200
+    """Returns the leaderboard data, sorted by wins."""
+    global leaderboard_sorted
+    with leaderboard_lock:
+        records = get_leaderboard_records()
+        flush_leaderboard()
+        # Sort by wins, descending, only when the records changed since the last request
+        if leaderboard_sorted is None:
+            leaderboard_sorted = sorted(records.values(), key=itemgetter("wins"), reverse=True)
+        return json_response(leaderboard_sorted)
 
 
 @app.route("/save", methods=["POST"])
 def save_game_to_file():
     """Saves the current game state to games.json."""
-    if game.game_status == "not_started":
-        return jsonify({"error": "No active game to save."}), 400
-
-    # Create a dictionary matching the required file format
-    state_to_save = {
-        "game_id": 1,  # Using a static ID as per the example
-        "game": get_current_state_json(),
-    }
+    with game_holder.lock:
+        game = game_holder.game
+        if game.game_status == GameStatus.NOT_STARTED:
+            return json_response({"error": "No active game to save."}, 400)
+
+        # Create a dictionary matching the required file format
+        state_to_save = {
+            "game_id": 1,  # Using a static ID as per the example
+            "game": get_current_state_json(game),
+        }
 
-    with open(GAME_STATE_FILE, "w") as f:
-        json.dump(state_to_save, f, indent=4)
+        write_json_file(GAME_STATE_FILE, state_to_save)
 
-    return jsonify({"message": f"Game state saved to {GAME_STATE_FILE}."}), 200
+        return json_response({"message": f"Game state saved to {GAME_STATE_FILE}."})
 
 
 @app.route("/load", methods=["GET"])
 def load_game_from_file():
     """Loads a saved game state from games.json."""
-    global game
-    if not os.path.exists(GAME_STATE_FILE):
-        return jsonify({"error": f"No saved game file found at {GAME_STATE_FILE}."}), 404
-
-    with open(GAME_STATE_FILE, "r") as f:
-        data = json.load(f)
+    # /save nests the game state under "game"; only that sub-document is used
+    try:
+        data = read_json_file(GAME_STATE_FILE)["game"]
+    except FileNotFoundError:
+        return json_response({"error": f"No saved game file found at {GAME_STATE_FILE}."}, 404)
 
     # Reconstruct the game object from the loaded data
     loaded_game = Game()
-    loaded_game.board = Game.Board()  # Use the nested Board class for clarity
-    loaded_game.board.grid = [[None for _ in range(9)] for _ in range(9)]
+    loaded_game.board = Board(setup=False)
 
-    # Re-create Piece objects on the board
+    # Re-create Piece objects on the board; the saved board is indexed [row][column]
     board_data = data["board"]
     for r_idx, row in enumerate(board_data):
         for c_idx, symbol in enumerate(row):
             if symbol:
-                piece_class, color = PIECE_MAP[symbol]
-                # Convert 0-indexed from file to 1-indexed for model
-                pos_tuple = (c_idx + 1, r_idx + 1)
-                loaded_game.board.grid[c_idx + 1][r_idx + 1] = piece_class(color, pos_tuple)
+                piece_class, color = PIECE_TABLE[ord(symbol)]
+                loaded_game.board.place_piece(piece_class(color, (c_idx, r_idx)))
 
     loaded_game.turn = PieceColor(data["turn"])
-    loaded_game.board.moveHistory = data["history"]
-    loaded_game.game_status = data["status"]
+    loaded_game.board.moveHistory = data["move_history"]
+    loaded_game.game_status = GameStatus(data["status"])
     loaded_game.winner = PieceColor(data["winner"]) if data.get("winner") else None
     loaded_game.player_white = data["players"]["white"]
     loaded_game.player_black = data["players"]["black"]
 
-    game = loaded_game  # Replace the global game object with the loaded one
+    # Build the response before publishing the game, so a concurrent /move cannot change it mid-read
+    state = get_current_state_json(loaded_game)
+    game_holder.swap(loaded_game)  # Replace the current game object with the loaded one
 
-    return jsonify({"message": "Game state loaded successfully.", "state": get_current_state_json()}), 200
+    return json_response({"message": "Game state loaded successfully.", "state": state})
 
 
 if __name__ == "__main__":
@@ -0,0 +1,164 @@
+"""
+bitboards.py - Bitboard Helpers
+
+This module holds the square numbering, movement tables and Zobrist keys used
+by the bitboards that Board keeps next to its grid. A square (column, row) is
+bit column * 8 + row, so "a1" is bit 0, "a8" is bit 7 and "h8" is bit 63.
+"""
+
+from __future__ import annotations
+import random
+from typing import Dict, List, Tuple
+
+KNIGHT_DELTAS = ((1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1), (-2, 1), (-1, 2))
+KING_DELTAS = ((1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1))
+
+
+def square_index(position: Tuple[int, int]) -> int:
+    """Return the bit index of a (column, row) position."""
+    return position[0] * 8 + position[1]
+
+
+def square_position(square: int) -> Tuple[int, int]:
+    """Return the (column, row) position of a bit index."""
+    return divmod(square, 8)
+
+
+def unpack_move(move: int) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+    """Return the (start, end) positions of a move packed as start_square << 6 | target_square."""
+    return divmod(move >> 6, 8), divmod(move & 63, 8)
+
+
+def _leaper_attacks(square: int, deltas) -> int:
+    """Return the bitboard of on-board squares reached from square by each (dx, dy) delta."""
+    column, row = square_position(square)
+    attacks = 0
+    for dx, dy in deltas:
+        x, y = column + dx, row + dy
+        if 0 <= x < 8 and 0 <= y < 8:
+            attacks |= 1 << (x * 8 + y)
+    return attacks
+
+
+# Attack sets per square, built once at import. Leaper attacks are symmetric, so
+# KNIGHT_ATTACKS[sq] is also the set of squares a knight could attack sq from.
+KNIGHT_ATTACKS: List[int] = [_leaper_attacks(sq, KNIGHT_DELTAS) for sq in range(64)]
+KING_ATTACKS: List[int] = [_leaper_attacks(sq, KING_DELTAS) for sq in range(64)]
+# PAWN_ATTACKS[side][sq]: squares a pawn of that side on sq captures on. A pawn of
+# one side attacks sq from PAWN_ATTACKS[other side][sq].
+PAWN_ATTACKS: List[List[int]] = [
+    [_leaper_attacks(sq, ((-1, 1), (1, 1))) for sq in range(64)],  # WHITE_SIDE
+    [_leaper_attacks(sq, ((-1, -1), (1, -1))) for sq in range(64)],  # BLACK_SIDE
+]
+# PAWN_PUSHES[side][sq]: squares a pawn of that side on sq moves straight ahead to,
+# including the two-square push from its starting row (row 1 for white, 6 for black).
+PAWN_PUSHES: List[List[int]] = [
+    [_leaper_attacks(sq, ((0, 1), (0, 2)) if sq % 8 == 1 else ((0, 1),)) for sq in range(64)],  # WHITE_SIDE
+    [_leaper_attacks(sq, ((0, -1), (0, -2)) if sq % 8 == 6 else ((0, -1),)) for sq in range(64)],  # BLACK_SIDE
+]
+
+
+def _line_mask(square: int, directions) -> int:
+    """Return the bitboard of squares along the given directions from square, excluding square itself."""
+    column, row = square_position(square)
+    mask = 0
+    for dx, dy in directions:
+        x, y = column + dx, row + dy
+        while 0 <= x < 8 and 0 <= y < 8:
+            mask |= 1 << (x * 8 + y)
+            x += dx
+            y += dy
+    return mask
+
+
+# Every line through a square has strictly increasing bit indexes (+1 up a column,
+# +8 along a row, +9 and +7 along the diagonals), which _line_attacks relies on.
+COLUMN_MASKS: List[int] = [_line_mask(sq, ((0, 1), (0, -1))) for sq in range(64)]
+ROW_MASKS: List[int] = [_line_mask(sq, ((1, 0), (-1, 0))) for sq in range(64)]
+DIAGONAL_MASKS: List[int] = [_line_mask(sq, ((1, 1), (-1, -1))) for sq in range(64)]
+ANTI_DIAGONAL_MASKS: List[int] = [_line_mask(sq, ((1, -1), (-1, 1))) for sq in range(64)]
+
+# Squares a rook or bishop on each square reaches on an empty board.
+ROOK_LINES: List[int] = [COLUMN_MASKS[sq] | ROW_MASKS[sq] for sq in range(64)]
+BISHOP_LINES: List[int] = [DIAGONAL_MASKS[sq] | ANTI_DIAGONAL_MASKS[sq] for sq in range(64)]
+
+
+def _line_attacks(occupied: int, mask: int, bit: int) -> int:
+    """Return the squares a slider on bit attacks along one line, up to and including the first blocker each way."""
+    blockers = occupied & mask
+    lower = blockers & (bit - 1)
+    upper = blockers ^ lower
+    # Nearest blocker below the slider, or bit 0 when there is none; subtracting it
+    # from upper flips every bit from there up to the nearest blocker above
+    nearest_lower = 1 << ((lower | 1).bit_length() - 1)
+    return mask & (upper ^ (upper - nearest_lower))
+
+
+def _line_interior(mask: int, bit: int) -> int:
+    """Return the squares of a line mask without the two board-edge squares where the line ends."""
+    line = mask | bit
+    return mask & ~(line & -line) & ~(1 << (line.bit_length() - 1))
+
+
+# A blocker on the edge square at the end of a line never hides anything, so a
+# slider's attacks only depend on the pieces standing on these interior squares.
+ROOK_MASKS: List[int] = [
+    _line_interior(COLUMN_MASKS[sq], 1 << sq) | _line_interior(ROW_MASKS[sq], 1 << sq) for sq in range(64)
+]
+BISHOP_MASKS: List[int] = [
+    _line_interior(DIAGONAL_MASKS[sq], 1 << sq) | _line_interior(ANTI_DIAGONAL_MASKS[sq], 1 << sq) for sq in range(64)
+]
+
+
+def _slider_table(square: int, mask: int, line_masks) -> Dict[int, int]:
+    """Map every subset of the square's mask to the attacks of a slider on square blocked by that subset."""
+    bit = 1 << square
+    table: Dict[int, int] = {}
+    subset = 0
+    while True:
+        table[subset] = _line_attacks(subset, line_masks[0][square], bit) | _line_attacks(subset, line_masks[1][square], bit)
+        subset = (subset - mask) & mask  # next subset of mask in counting order
+        if not subset:
+            return table
+
+
+# Slider attacks per square, keyed by the occupancy masked to ROOK_MASKS/BISHOP_MASKS.
+# This is the magic bitboard lookup with a dict standing in for the multiply-and-shift
+# index: Python ints hash to themselves, so no magic numbers have to be searched for.
+ROOK_TABLES: List[Dict[int, int]] = [_slider_table(sq, ROOK_MASKS[sq], (COLUMN_MASKS, ROW_MASKS)) for sq in range(64)]
+BISHOP_TABLES: List[Dict[int, int]] = [
+    _slider_table(sq, BISHOP_MASKS[sq], (DIAGONAL_MASKS, ANTI_DIAGONAL_MASKS)) for sq in range(64)
+]
+
+
+def rook_attacks(square: int, occupied: int) -> int:
+    """Return the bitboard of squares a rook on square attacks given the occupied squares."""
+    return ROOK_TABLES[square][occupied & ROOK_MASKS[square]]
+
+
+def bishop_attacks(square: int, occupied: int) -> int:
+    """Return the bitboard of squares a bishop on square attacks given the occupied squares."""
+    return BISHOP_TABLES[square][occupied & BISHOP_MASKS[square]]
+
+
+def _between(a: int, b: int) -> int:
+    """Return the squares strictly between a and b when they share a line, otherwise 0."""
+    if rook_attacks(a, 0) >> b & 1:
+        return rook_attacks(a, 1 << b) & rook_attacks(b, 1 << a)
+    if bishop_attacks(a, 0) >> b & 1:
+        return bishop_attacks(a, 1 << b) & bishop_attacks(b, 1 << a)
+    return 0
+
+
+# BETWEEN[a][b]: squares a piece must stand on to block a slider on b from reaching a.
+BETWEEN: List[List[int]] = [[_between(a, b) for b in range(64)] for a in range(64)]
+
+
+# Zobrist keys: a position's hash is the XOR of ZOBRIST_KEYS[side][piece_type][square]
+# over its pieces, toggled with ZOBRIST_SIDE after every move. A fixed seed keeps
+# hashes stable between runs.
+_zobrist_random = random.Random(0x5EED)
+ZOBRIST_KEYS: List[List[List[int]]] = [
+    [[_zobrist_random.getrandbits(64) for _ in range(64)] for _ in range(6)] for _ in range(2)
+]
+ZOBRIST_SIDE: int = _zobrist_random.getrandbits(64)
@@ -1,7 +1,10 @@
 from __future__ import annotations
-from typing import List, Optional, Tuple
+from typing import List, NamedTuple, Optional, Tuple
 from enum import Enum
 from pieces import Piece, PieceColor, Pawn, Rook, Knight, Bishop, Queen, King
+from pieces import PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, WHITE_SIDE, BLACK_SIDE, SQUARE_NAMES
+from bitboards import KNIGHT_ATTACKS, KING_ATTACKS, PAWN_ATTACKS, PAWN_PUSHES, BETWEEN, ZOBRIST_KEYS, ZOBRIST_SIDE
+from bitboards import rook_attacks, bishop_attacks, unpack_move
 
 
 class Difficulty(Enum):
@@ -10,6 +13,26 @@ class Difficulty(Enum):
     HARD = "hard"
 
 
+class GameStatus(str, Enum):
+    NOT_STARTED = "not_started"
+    ACTIVE = "active"
+    CHECKMATE = "checkmate"
+    STALEMATE = "stalemate"
+    DRAW = "draw"
+
+    def __str__(self):
+        return self.value
+
+
+class UndoInfo(NamedTuple):
+    """Everything Board.unmake_move needs to take back a move made with Board.make_move."""
+
+    start_square: int
+    target_square: int
+    captured: Optional[Piece]
+    zobrist_key: int
+
+
 class Board:
     """
     Class representing a chess board.
@@ -18,129 +41,315 @@ class Board:
     movement validation, check detection, and checkmate detection.
 
     Attributes:
-        grid (list): 8x8 grid representing the chess board with pieces
+        grid (list): 64-entry list of the pieces on the board, indexed by column * 8 + row
         moveHistory (list): List of moves made during the game
+        bitboards (list): Bitboard of every piece type, indexed [side][piece_type]
+        occupancy (list): Bitboard of all squares held by each side, indexed [side]
+        zobrist_key (int): Zobrist hash of the current position, updated on every move
+        position_history (list): Zobrist hash of the position before each move played
+        irreversible_index (int): First position_history index after the last pawn move or capture
     """
 
-    def __init__(self):
-        self.grid: List[List[Optional[Piece]]] = [[None for _ in range(8)] for _ in range(8)]
+    def __init__(self, setup: bool = True):
+        self.grid: List[Optional[Piece]] = [None] * 64
         self.moveHistory = []
-        self.setup_board()
+        self.bitboards: List[List[int]] = [[0] * 6 for _ in range(2)]
+        self.occupancy: List[int] = [0, 0]
+        self.zobrist_key: int = 0
+        self.position_history: List[int] = []
+        self.irreversible_index: int = 0
+        self._check_cache: Optional[tuple] = None  # (zobrist_key, result) of the last is_check() call
+        if setup:
+            self.setup_board()
 
     def setup_board(self):
         """Initializes the chess board with pieces in their starting positions."""
         for i in range(8):
-            self.grid[i][1] = Pawn(PieceColor.WHITE, (i, 1))
-            self.grid[i][6] = Pawn(PieceColor.BLACK, (i, 6))
-        self.grid[0][0] = Rook(PieceColor.WHITE, (0, 0))
-        self.grid[7][0] = Rook(PieceColor.WHITE, (7, 0))
-        self.grid[0][7] = Rook(PieceColor.BLACK, (0, 7))
-        self.grid[7][7] = Rook(PieceColor.BLACK, (7, 7))
-        self.grid[1][0] = Knight(PieceColor.WHITE, (1, 0))
-        self.grid[6][0] = Knight(PieceColor.WHITE, (6, 0))
-        self.grid[1][7] = Knight(PieceColor.BLACK, (1, 7))
-        self.grid[6][7] = Knight(PieceColor.BLACK, (6, 7))
-        self.grid[2][0] = Bishop(PieceColor.WHITE, (2, 0))
-        self.grid[5][0] = Bishop(PieceColor.WHITE, (5, 0))
-        self.grid[2][7] = Bishop(PieceColor.BLACK, (2, 7))
-        self.grid[5][7] = Bishop(PieceColor.BLACK, (5, 7))
-        self.grid[3][0] = Queen(PieceColor.WHITE, (3, 0))
-        self.grid[3][7] = Queen(PieceColor.BLACK, (3, 7))
-        self.grid[4][7] = King(PieceColor.BLACK, (4, 7))
-        self.grid[4][0] = King(PieceColor.WHITE, (4, 0))
-
-    def move_piece(self, current_pos: Tuple[int, int], new_pos: Tuple[int, int]) -> bool:
-        """Move a piece from current position to new position."""
-        piece: Optional[Piece] = self.grid[current_pos[0]][current_pos[1]]
+            self.place_piece(Pawn(PieceColor.WHITE, (i, 1)))
+            self.place_piece(Pawn(PieceColor.BLACK, (i, 6)))
+        self.place_piece(Rook(PieceColor.WHITE, (0, 0)))
+        self.place_piece(Rook(PieceColor.WHITE, (7, 0)))
+        self.place_piece(Rook(PieceColor.BLACK, (0, 7)))
+        self.place_piece(Rook(PieceColor.BLACK, (7, 7)))
+        self.place_piece(Knight(PieceColor.WHITE, (1, 0)))
+        self.place_piece(Knight(PieceColor.WHITE, (6, 0)))
+        self.place_piece(Knight(PieceColor.BLACK, (1, 7)))
+        self.place_piece(Knight(PieceColor.BLACK, (6, 7)))
+        self.place_piece(Bishop(PieceColor.WHITE, (2, 0)))
+        self.place_piece(Bishop(PieceColor.WHITE, (5, 0)))
+        self.place_piece(Bishop(PieceColor.BLACK, (2, 7)))
+        self.place_piece(Bishop(PieceColor.BLACK, (5, 7)))
+        self.place_piece(Queen(PieceColor.WHITE, (3, 0)))
+        self.place_piece(Queen(PieceColor.BLACK, (3, 7)))
+        self.place_piece(King(PieceColor.BLACK, (4, 7)))
+        self.place_piece(King(PieceColor.WHITE, (4, 0)))
+
+    def place_piece(self, piece: Piece):
+        """Put a piece on the empty square given by its own position."""
+        column, row = piece.position
+        self.grid[column * 8 + row] = piece
+        self._toggle_bit(piece, 1 << (column * 8 + row))
+        self.zobrist_key ^= ZOBRIST_KEYS[piece.side][piece.piece_type][column * 8 + row]
+
+    def _toggle_bit(self, piece: Piece, bit: int):
+        """Flip the given square bit(s) on the piece's bitboard and on its side's occupancy."""
+        self.bitboards[piece.side][piece.piece_type] ^= bit
+        self.occupancy[piece.side] ^= bit
+
+    def move_piece(self, current_pos: Tuple[int, int], new_pos: Tuple[int, int]) -> (bool, str):
+        """Move a piece from current position to new position, returning success and the reason for a refusal."""
+        piece: Optional[Piece] = self.grid[current_pos[0] * 8 + current_pos[1]]
         # Check if piece exists and if the move is valid
-        if not piece or not piece.is_valid_move(current_pos, new_pos, self.grid):
-            return False
+        if not piece:
+            return False, "No piece at the starting position"
+        if not piece.is_valid_move(current_pos, new_pos, self.grid):
+            return False, "Invalid move for the piece"
         in_check_color: Optional[PieceColor] = self.is_check()  # check if any king is in check
-        if in_check_color and piece.get_color() == in_check_color:  # if piece's king is in check
+        if in_check_color and piece.color == in_check_color:  # if piece's king is in check
             # Try the move
-            captured_piece: Optional[Piece] = self.grid[new_pos[0]][new_pos[1]]  # store potentially captured piece
-
-            # Make the move temporarily
-            self.grid[new_pos[0]][new_pos[1]] = piece  # place piece in new position
-            self.grid[current_pos[0]][current_pos[1]] = None  # remove piece from current position
-            piece.set_position(new_pos)  # update piece's internal position
-
+            undo = self.make_move(current_pos, new_pos)
             still_in_check: bool = self.is_check() == in_check_color  # Check if still in check after the move
-
-            # Undo the move
-            self.grid[current_pos[0]][current_pos[1]] = piece  # restore piece to original position
-            self.grid[new_pos[0]][new_pos[1]] = captured_piece  # restore captured piece if any
-            piece.set_position(current_pos)  # reset piece's internal position
+            self.unmake_move(undo)
 
             if still_in_check:
-                return False  # Move doesn't resolve check
-        self.grid[new_pos[0]][new_pos[1]] = piece  # place piece in new position
-        self.grid[current_pos[0]][current_pos[1]] = None  # remove piece from current position
+                return False, "Invalid move: King is in check"  # Move doesn't resolve check
         self.moveHistory.append(
-            [piece.get_algebraic_position(), str(chr((new_pos[0] + 1) + 96)) + str(new_pos[1] + 1)]
+            [piece.get_algebraic_position(), SQUARE_NAMES[new_pos[0]][new_pos[1]]]
         )  # add move to history in algebraic notation
-        piece.set_position(new_pos)  # update piece's internal position
-        return True
+        self.position_history.append(self.zobrist_key)
+        if piece.piece_type == PAWN or self.grid[new_pos[0] * 8 + new_pos[1]] is not None:
+            # Nothing played before a pawn move or capture can come back, so repetition scans stop here
+            self.irreversible_index = len(self.position_history)
+        self.make_move(current_pos, new_pos)
+        piece.position = new_pos
+        return True, "Move successful"
+
+    def make_move(self, current_pos: Tuple[int, int], new_pos: Tuple[int, int]) -> UndoInfo:
+        """Move a piece on the grid and bitboards without validation and return the record unmake_move needs."""
+        return self.make_square_move(current_pos[0] * 8 + current_pos[1], new_pos[0] * 8 + new_pos[1])
+
+    def make_square_move(self, start_square: int, target_square: int) -> UndoInfo:
+        """Same as make_move, for a move given by bit indexes."""
+        # piece.position is left alone so simulated moves stay cheap; move_piece updates it for real moves
+        grid = self.grid
+        piece: Piece = grid[start_square]
+        captured: Optional[Piece] = grid[target_square]
+        grid[target_square] = piece
+        grid[start_square] = None
+        previous_key = self.zobrist_key
+        piece_keys = ZOBRIST_KEYS[piece.side][piece.piece_type]
+        key = previous_key ^ piece_keys[start_square] ^ piece_keys[target_square] ^ ZOBRIST_SIDE
+        if captured is not None:
+            self._toggle_bit(captured, 1 << target_square)
+            key ^= ZOBRIST_KEYS[captured.side][captured.piece_type][target_square]
+        self._toggle_bit(piece, (1 << start_square) | (1 << target_square))
+        self.zobrist_key = key
+        return UndoInfo(start_square, target_square, captured, previous_key)
+
+    def unmake_move(self, undo: UndoInfo):
+        """Restore the grid to the state before the make_move call that returned the undo record."""
+        start_square, target_square, captured, self.zobrist_key = undo
+        grid = self.grid
+        piece: Piece = grid[target_square]
+        grid[start_square] = piece
+        grid[target_square] = captured
+        target_bit = 1 << target_square
+        self._toggle_bit(piece, (1 << start_square) | target_bit)
+        if captured is not None:
+            self._toggle_bit(captured, target_bit)
+
+    def is_repetition(self, times: int = 3) -> bool:
+        """Check if the current position has now occurred the given number of times."""
+        key: int = self.zobrist_key
+        history: List[int] = self.position_history
+        seen: int = 1
+        # Only every other entry has the same side to move, and the most recent ones are the likeliest matches
+        for index in range(len(history) - 2, self.irreversible_index - 1, -2):
+            if history[index] == key:
+                seen += 1
+                if seen >= times:
+                    return True
+        return False
+
+    def attackers_to(self, square: int, side: int, occupied: Optional[int] = None) -> int:
+        """Return a bitboard of the pieces of the given side that attack the square (a bit index)."""
+        pieces = self.bitboards[side]
+        if occupied is None:  # callers may pass a different occupancy, e.g. with a king lifted off the board
+            occupied = self.occupancy[WHITE_SIDE] | self.occupancy[BLACK_SIDE]
+        attackers = (
+            # A pawn attacks the square from where an opposing pawn on the square would capture
+            (PAWN_ATTACKS[side ^ 1][square] & pieces[PAWN])
+            | (KNIGHT_ATTACKS[square] & pieces[KNIGHT])
+            | (KING_ATTACKS[square] & pieces[KING])
+        )
+
+        # Sliders attack the square exactly when a slider of the same kind on it would see them
+        diagonal_sliders = pieces[BISHOP] | pieces[QUEEN]
+        if diagonal_sliders:
+            attackers |= bishop_attacks(square, occupied) & diagonal_sliders
+        orthogonal_sliders = pieces[ROOK] | pieces[QUEEN]
+        if orthogonal_sliders:
+            attackers |= rook_attacks(square, occupied) & orthogonal_sliders
+        return attackers
+
+    def king_square(self, side: int) -> int:
+        """Return the bit index of the side's king, or -1 if it has none."""
+        # bit_length() - 1 picks the highest square, i.e. the last king a column-by-column scan finds
+        return self.bitboards[side][KING].bit_length() - 1
 
     def is_check(self) -> Optional[PieceColor]:
         """Check if either king is in check and return the color of the king in check."""
-        white_king_pos: Optional[Piece] = None
-        black_king_pos: Optional[Piece] = None
-        # Find the positions of both kings
-        for column in range(8):
-            for row in range(8):
-                piece: Optional[Piece] = self.grid[column][row]
-                if isinstance(piece, King):  # if piece is a king
-                    if piece.get_color() == PieceColor.WHITE:
-                        white_king_pos = (column, row)  # store white king position
-                    elif piece.get_color() == PieceColor.BLACK:
-                        black_king_pos = (column, row)  # store black king position
-            if white_king_pos and black_king_pos:
-                break
-
-        # Check if any piece can attack the opposing king
-        for column in range(8):
-            for row in range(8):
-                piece: Optional[Piece] = self.grid[column][row]
-                if piece:
-                    if piece.get_color() == PieceColor.WHITE and black_king_pos:  # if white piece and black king exists
-                        if piece.is_valid_move((column, row), black_king_pos, self.grid):  # check if piece can attack black king
-                            return PieceColor.BLACK  # black king is in check
-                    elif piece.get_color() == PieceColor.BLACK and white_king_pos:  # if black piece and white king exists
-                        if piece.is_valid_move((column, row), white_king_pos, self.grid):  # check if piece can attack white king
-                            return PieceColor.WHITE  # white king is in check
-
+        # A move, undo or placement always changes the Zobrist key, so a matching key means the same position
+        cache = self._check_cache
+        if cache is not None and cache[0] == self.zobrist_key:
+            return cache[1]
+        checked_color: Optional[PieceColor] = self._find_check()
+        self._check_cache = (self.zobrist_key, checked_color)
+        return checked_color
+
+    def _find_check(self) -> Optional[PieceColor]:
+        """Return the color of the king in check, looking at the attackers of both kings."""
+        white_king: int = self.king_square(WHITE_SIDE)
+        black_king: int = self.king_square(BLACK_SIDE)
+        white_attackers: int = self.attackers_to(white_king, BLACK_SIDE) if white_king >= 0 else 0
+        black_attackers: int = self.attackers_to(black_king, WHITE_SIDE) if black_king >= 0 else 0
+
+        if white_attackers and black_attackers:
+            # Both kings attacked: report the one whose attacker comes first in a column-by-column scan
+            if (black_attackers & -black_attackers) < (white_attackers & -white_attackers):
+                return PieceColor.BLACK
+            return PieceColor.WHITE
+        if black_attackers:
+            return PieceColor.BLACK  # black king is in check
+        if white_attackers:
+            return PieceColor.WHITE  # white king is in check
         return None
 
+    def pinned_pieces(self, side: int, king_square: int) -> int:
+        """Return a bitboard of the side's pieces pinned against its king by an enemy slider."""
+        enemy_pieces = self.bitboards[side ^ 1]
+        enemy_occupancy = self.occupancy[side ^ 1]
+        occupied = self.occupancy[side] | enemy_occupancy
+        # Enemy sliders that would attack the king if the side's own pieces were not in the way
+        snipers = (rook_attacks(king_square, enemy_occupancy) & (enemy_pieces[ROOK] | enemy_pieces[QUEEN])) | (
+            bishop_attacks(king_square, enemy_occupancy) & (enemy_pieces[BISHOP] | enemy_pieces[QUEEN])
+        )
+        pinned = 0
+        while snipers:
+            sniper = snipers & -snipers
+            snipers ^= sniper
+            blockers = BETWEEN[king_square][sniper.bit_length() - 1] & occupied
+            if blockers and not blockers & (blockers - 1):  # exactly one piece in between, and it is ours
+                pinned |= blockers
+        return pinned
+
     def is_checkmate(self, checked_color) -> bool:
         """Check if the player whose king is in check has no valid moves to escape check."""
+        side: int = WHITE_SIDE if checked_color == PieceColor.WHITE else BLACK_SIDE
+        enemy: int = side ^ 1
+        king_square: int = self.king_square(side)
+        if king_square < 0:
+            return False
+        checkers: int = self.attackers_to(king_square, enemy)
+        if not checkers:
+            return False
 
-        # Try every possible move for the checked player
-        for col1 in range(8):
-            for row1 in range(8):
-                piece: Optional[Piece] = self.grid[col1][row1]
-                if piece and piece.get_color() == checked_color:
-                    for col2 in range(8):
-                        for row2 in range(8):
-                            if piece.is_valid_move((col1, row1), (col2, row2), self.grid):
-                                # Save original state
-                                captured = self.grid[col2][row2]
-                                self.grid[col2][row2] = piece
-                                self.grid[col1][row1] = None
-                                original_pos = piece.position
-                                piece.set_position((col2, row2))
-
-                                still_in_check = self.is_check() == checked_color
-
-                                # Undo
-                                self.grid[col1][row1] = piece
-                                self.grid[col2][row2] = captured
-                                piece.set_position(original_pos)
-
-                                if not still_in_check:
-                                    return False
+        # Try every king step. The king is taken out of the occupancy so sliders see through it to the
+        # squares behind, and a piece the step captures cannot defend its own square
+        occupied_without_king: int = (self.occupancy[WHITE_SIDE] | self.occupancy[BLACK_SIDE]) ^ (1 << king_square)
+        attackers_to = self.attackers_to
+        targets: int = KING_ATTACKS[king_square] & ~self.occupancy[side]
+        while targets:
+            target = targets & -targets
+            targets ^= target
+            if not attackers_to(target.bit_length() - 1, enemy, occupied_without_king) & ~target:
+                return False
+
+        # Against a double check only the king can move
+        if checkers & (checkers - 1):
+            return True
+
+        # Any other piece has to capture the checker or block its line; a pinned piece can do neither
+        checker_square: int = checkers.bit_length() - 1
+        targets = checkers | BETWEEN[king_square][checker_square]
+        # The target squares are the same for every piece, so decode them to (column, row) once
+        target_positions: List[Tuple[int, int]] = []
+        while targets:
+            target = targets & -targets
+            targets ^= target
+            target_positions.append(divmod(target.bit_length() - 1, 8))
+
+        movable: int = self.occupancy[side] & ~(1 << king_square) & ~self.pinned_pieces(side, king_square)
+        grid = self.grid
+        while movable:
+            start = movable & -movable
+            movable ^= start
+            start_square = start.bit_length() - 1
+            start_pos = divmod(start_square, 8)
+            is_valid_move = grid[start_square].is_valid_move
+            for target_pos in target_positions:
+                if is_valid_move(start_pos, target_pos, grid):
+                    return False
         return True
 
+    def get_legal_moves(self, side: int) -> List[int]:
+        """Return every move of the side that its piece allows and that leaves its own king unattacked, packed as start_square << 6 | target_square."""
+        enemy: int = side ^ 1
+        own: int = self.occupancy[side]
+        occupied: int = own | self.occupancy[enemy]
+        grid = self.grid
+        king_square: int = self.king_square(side)
+        if king_square >= 0:
+            checkers: int = self.attackers_to(king_square, enemy)
+            pinned: int = self.pinned_pieces(side, king_square)
+            occupied_without_king: int = occupied ^ (1 << king_square)
+
+        moves: List[int] = []
+        pieces: int = own
+        while pieces:
+            start = pieces & -pieces
+            pieces ^= start
+            square = start.bit_length() - 1
+            piece_type = grid[square].piece_type
+            if piece_type == KNIGHT:
+                targets = KNIGHT_ATTACKS[square] & ~own
+            elif piece_type == KING:
+                targets = KING_ATTACKS[square] & ~own
+            elif piece_type == ROOK:
+                targets = rook_attacks(square, occupied) & ~own
+            elif piece_type == BISHOP:
+                targets = bishop_attacks(square, occupied) & ~own
+            elif piece_type == QUEEN:
+                targets = (rook_attacks(square, occupied) | bishop_attacks(square, occupied)) & ~own
+            else:
+                # Pawns: captures onto enemy pieces, and pushes onto empty squares without jumping a piece
+                targets = PAWN_ATTACKS[side][square] & self.occupancy[enemy]
+                pushes = PAWN_PUSHES[side][square] & ~occupied
+                while pushes:
+                    push = pushes & -pushes
+                    pushes ^= push
+                    if not BETWEEN[square][push.bit_length() - 1] & occupied:
+                        targets |= push
+
+            while targets:
+                target = targets & -targets
+                targets ^= target
+                target_square = target.bit_length() - 1
+                if king_square < 0:
+                    pass  # no king to expose
+                elif square == king_square:
+                    # Sliders see through the king's old square, and a captured piece no longer defends its own
+                    if self.attackers_to(target_square, enemy, occupied_without_king) & ~target:
+                        continue
+                elif checkers or start & pinned:
+                    undo = self.make_square_move(square, target_square)
+                    exposed = self.attackers_to(king_square, enemy)
+                    self.unmake_move(undo)
+                    if exposed:
+                        continue
+                moves.append(square << 6 | target_square)
+        return moves
+
 
 class Game:
     """
@@ -151,7 +360,7 @@ class Game:
     Attributes:
         board (Board): The chess board for the game.
         turn (str): The color of the player whose turn it is ('white' or 'black').
-        game_status (str): The current status of the game ('active', 'checkmate', 'stalemate', 'draw').
+        game_status (GameStatus): The current status of the game ('active', 'checkmate', 'stalemate', 'draw').
         winner (Optional[str]): The color of the winning player, if any.
         difficulty (Difficulty): The difficulty level of the game.
     """
@@ -159,116 +368,247 @@ class Game:
     def __init__(self):
         self.board = None
         self.turn = PieceColor.WHITE  # Default starting player
-        self.game_status = "not_started"  # Can be "active", "checkmate", "stalemate", "draw"
+        self.game_status = GameStatus.NOT_STARTED  # Can be ACTIVE, CHECKMATE, STALEMATE, DRAW
         self.winner = None
         self.difficulty = Difficulty.MEDIUM  # Default difficulty level
         self.player_white = ""
         self.player_black = ""
+        self._state_cache: Optional[dict] = None  # Last built get_game_state() result
 
     def start_game(self, difficulty: Difficulty, white_player: str, black_player: str):
         """Initialize a new game with the specified difficulty level"""
         self.board = Board()
         self.turn = PieceColor.WHITE
-        self.game_status = "active"
+        self.game_status = GameStatus.ACTIVE
         self.winner = None
         self.difficulty: Difficulty = difficulty
         self.player_white = white_player
         self.player_black = black_player
+        self._state_cache = None
 
     def end_game(self):
         """End the game and reset the board"""
         self.board = None
         self.turn = PieceColor.WHITE
-        self.game_status = "not_started"
+        self.game_status = GameStatus.NOT_STARTED
         self.winner = None
         self.difficulty = Difficulty.MEDIUM
         self.player_white = ""
         self.player_black = ""
+        self._state_cache = None
 
-    def serialize_board_to_symbols(self, board_grid):
-        """Converts the Board object's grid into a simple 2D list of piece symbols."""
-        if not board_grid:
+    def serialize_board_to_symbols(self, board):
+        """Converts the Board object's grid into a simple 2D list of piece symbols, indexed [row][column]."""
+        if not board:
             return None
 
-        serialized_grid = [[None for _ in range(8)] for _ in range(8)]
-        for r in range(8):
-            for c in range(8):
-                piece = board_grid[c][r]
-                if piece:
-                    serialized_grid[r][c] = piece.get_symbol()
-        return serialized_grid
+        grid = board.grid
+        # grid[row::8] walks one row across the columns, since square = column * 8 + row
+        return [[piece.symbol if piece else None for piece in grid[row::8]] for row in range(8)]
 
     def get_game_state(self):
-        """Return the current state of the game"""
-        check: Optional[PieceColor] = self.board.is_check()
-        return {
-            "board": self.serialize_board_to_symbols(self.board.grid),
-            "turn": self.turn.value,
-            "status": self.game_status,
-            "winner": str(self.winner.value) if self.winner else None,
-            "is_check": check.value if check else None,
-            "move_history": self.get_move_history(),
-            "players": {"white": self.player_white, "black": self.player_black},
-        }
+        """Return the current state of the game, rebuilding it only after the game has changed"""
+        if self._state_cache is None:
+            check: Optional[PieceColor] = self.board.is_check()
+            self._state_cache = {
+                "board": self.serialize_board_to_symbols(self.board),
+                "turn": self.turn,
+                "status": self.game_status,
+                "winner": self.winner,
+                "is_check": check,
+                "move_history": self.get_move_history(),
+                "players": {"white": self.player_white, "black": self.player_black},
+            }
+        return self._state_cache
 
     def make_move(self, current_pos: Tuple[list, list], new_pos: Tuple[list, list]) -> (bool, str):
         """Process a move and update game state accordingly"""
         # Check if game is already over
-        if self.game_status != "active":
+        if self.game_status != GameStatus.ACTIVE:
             return False, f"Game already ended: {self.game_status}"
 
         # Check if it's the correct player's turn
-        piece = self.board.grid[current_pos[0]][current_pos[1]]
+        piece = self.board.grid[current_pos[0] * 8 + current_pos[1]]
         if not piece:
             return False, "No piece at the starting position"
 
         # Validate piece color
-        if piece.get_color() != self.turn:
+        if piece.color != self.turn:
             return False, f"It's {self.turn}'s turn to move"
 
         # Attempt to make the move
-        move_successful = self.board.move_piece(current_pos, new_pos)
+        move_successful, message = self.board.move_piece(current_pos, new_pos)
         if not move_successful:
-            if self.board.is_check():
-                return False, "Invalid move: King is in check"
-            return False, "Invalid move for the piece"
+            return False, message
+        self._state_cache = None  # The board changed, so the cached state is stale
 
         # Check for checkmate and stalemate after move
         self.check_game_end_conditions()
 
         # Change turn if game is still active
-        if self.game_status == "active":
-            self.turn = PieceColor.BLACK if self.turn == PieceColor.WHITE else PieceColor.WHITE
+        if self.game_status == GameStatus.ACTIVE:
+            self.turn = self.turn.opposite()
 
         return True, "Move successful"
 
-    def check_game_end_conditions(self) -> Optional[Tuple[str, PieceColor]]:
+    def check_game_end_conditions(self) -> Optional[Tuple[GameStatus, PieceColor]]:
         """Check if the game has ended (checkmate, stalemate)"""
         # Check for checkmate
         checked_color: Optional[str] = self.board.is_check()
         if checked_color:
             if self.board.is_checkmate(checked_color):
-                self.game_status = "checkmate"
-                self.winner = PieceColor.WHITE if checked_color == PieceColor.BLACK else PieceColor.BLACK
+                self.game_status = GameStatus.CHECKMATE
+                self.winner = checked_color.opposite()
                 return self.game_status, self.winner
         # Game continues
-        self.game_status = "active"
+        self.game_status = GameStatus.ACTIVE
 
     def get_move_history(self):
         """Return the history of moves in the game"""
         return self.board.moveHistory
 
 
+# Material value of each piece type, indexed by piece_type (PAWN ... KING)
+PIECE_VALUES: Tuple[int, ...] = (1, 3, 3, 5, 9, 0)
+MATE_SCORE: int = 100000
+INFINITY: int = 1000000
+
+# Transposition table: a replace-always list indexed by the low bits of the Zobrist key. Each
+# entry is (key, side, depth, score, bound, best_move), where bound says whether the score is
+# exact or only a lower/upper bound because the search was cut off.
+TRANSPOSITION_TABLE_BITS: int = 20
+TRANSPOSITION_TABLE_MASK: int = (1 << TRANSPOSITION_TABLE_BITS) - 1
+EXACT, LOWER_BOUND, UPPER_BOUND = range(3)
+
+
 class AIPlayer:
     """
     Class representing an AI player in the chess game.
     This class is responsible for making moves based on the difficulty level.
     Attributes:
         difficulty (Difficulty): The difficulty level of the AI player.
+        killer_moves (list): Up to two quiet moves per remaining depth that caused a cutoff in the current search
+        transpositions (list): Transposition table of searched positions, kept between searches
     """
 
+    # Search depth in plies for each difficulty level
+    SEARCH_DEPTHS = {Difficulty.EASY: 1, Difficulty.MEDIUM: 3, Difficulty.HARD: 5}
+
     def __init__(self, difficulty: Difficulty):
         self.difficulty = difficulty
-
-    def get_best_move(self):
-        pass
+        self.killer_moves: List[list] = []
+        self.transpositions: List[Optional[tuple]] = [None] * (1 << TRANSPOSITION_TABLE_BITS)
+
+    def get_best_move(self, board: Board, color: PieceColor) -> Optional[Tuple[Tuple[int, int], Tuple[int, int]]]:
+        """Return the best (start, end) move for color from an iteratively deepened alpha-beta search, or None if it has no legal move."""
+        side: int = WHITE_SIDE if color == PieceColor.WHITE else BLACK_SIDE
+        max_depth: int = self.SEARCH_DEPTHS[self.difficulty]
+        self.killer_moves = [[] for _ in range(max_depth + 1)]
+        best_move: Optional[int] = None
+        # Each pass stores its best move at the root, so the next, deeper pass searches it first
+        for depth in range(1, max_depth + 1):
+            best_move = self._search_root(board, side, depth)
+            if best_move is None:
+                return None
+        return unpack_move(best_move)
+
+    def _search_root(self, board: Board, side: int, depth: int) -> Optional[int]:
+        """Search every legal move of side depth plies deep and return the best packed move, storing it in the transposition table."""
+        key: int = board.zobrist_key
+        index: int = key & TRANSPOSITION_TABLE_MASK
+        entry = self.transpositions[index]
+        hint = entry[5] if entry is not None and entry[0] == key and entry[1] == side else None
+        best_move = None
+        alpha: int = -INFINITY
+        for move in self._order_moves(board, board.get_legal_moves(side), depth, hint):
+            undo = board.make_square_move(move >> 6, move & 63)
+            score = -self._negamax(board, side ^ 1, depth - 1, -INFINITY, -alpha)
+            board.unmake_move(undo)
+            if best_move is None or score > alpha:
+                alpha = score
+                best_move = move
+        if best_move is not None:
+            self.transpositions[index] = (key, side, depth, alpha, EXACT, best_move)
+        return best_move
+
+    def _negamax(self, board: Board, side: int, depth: int, alpha: int, beta: int) -> int:
+        """Return the score of the position for side to move, searched depth plies deep within the alpha-beta window."""
+        if not board.bitboards[side][KING]:
+            return -MATE_SCORE - depth  # the king was captured after being left in check
+        if depth == 0:
+            return self._evaluate(board, side)
+
+        key: int = board.zobrist_key
+        index: int = key & TRANSPOSITION_TABLE_MASK
+        entry = self.transpositions[index]
+        hint = None
+        if entry is not None and entry[0] == key and entry[1] == side:
+            _, _, entry_depth, entry_score, bound, hint = entry
+            if entry_depth >= depth:
+                if bound == EXACT:
+                    return entry_score
+                if bound == LOWER_BOUND and entry_score >= beta:
+                    return entry_score
+                if bound == UPPER_BOUND and entry_score <= alpha:
+                    return entry_score
+        original_alpha: int = alpha
+
+        moves = board.get_legal_moves(side)
+        if not moves:
+            if board.attackers_to(board.king_square(side), side ^ 1):
+                return -MATE_SCORE - depth  # checkmate; mates nearer the root score lower
+            return 0  # stalemate
+
+        best: int = -INFINITY
+        best_move = None
+        for move in self._order_moves(board, moves, depth, hint):
+            undo = board.make_square_move(move >> 6, move & 63)
+            score = -self._negamax(board, side ^ 1, depth - 1, -beta, -alpha)
+            board.unmake_move(undo)
+            if score > best:
+                best = score
+                best_move = move
+                if best > alpha:
+                    alpha = best
+                    if alpha >= beta:
+                        if undo.captured is None:  # remember quiet refutations to try early in sibling nodes
+                            killers = self.killer_moves[depth]
+                            if move not in killers:
+                                killers.insert(0, move)
+                                del killers[2:]
+                        break  # the opponent already has a better option earlier in the tree
+
+        if best <= original_alpha:
+            bound = UPPER_BOUND
+        elif best >= beta:
+            bound = LOWER_BOUND
+        else:
+            bound = EXACT
+        self.transpositions[index] = (key, side, depth, best, bound, best_move)
+        return best
+
+    def _order_moves(self, board: Board, moves: list, depth: int, hint=None) -> list:
+        """Sort moves so likely cutoffs come first: the hint move, then captures by MVV-LVA, then killer moves."""
+        grid = board.grid
+        killers = self.killer_moves[depth]
+
+        def move_order_key(move: int) -> int:
+            if move == hint:
+                return INFINITY  # best move of an earlier search of this position
+            victim: Optional[Piece] = grid[move & 63]
+            if victim is not None:
+                # Most valuable victim first, least valuable attacker breaking ties; always above quiet moves
+                return 10 * PIECE_VALUES[victim.piece_type] - PIECE_VALUES[grid[move >> 6].piece_type]
+            return 0 if move in killers else -10
+
+        moves.sort(key=move_order_key, reverse=True)
+        return moves
+
+    @staticmethod
+    def _evaluate(board: Board, side: int) -> int:
+        """Return the material balance from the point of view of side."""
+        white, black = board.bitboards
+        score: int = 0
+        for piece_type in (PAWN, KNIGHT, BISHOP, ROOK, QUEEN):
+            score += PIECE_VALUES[piece_type] * (white[piece_type].bit_count() - black[piece_type].bit_count())
+        return score if side == WHITE_SIDE else -score
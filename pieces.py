@@ -9,15 +9,42 @@ It includes their specific movement logic and attributes.
 from __future__ import annotations
 from typing import List, Optional, Tuple
 from enum import Enum
+from bitboards import KNIGHT_ATTACKS, KING_ATTACKS, PAWN_ATTACKS, PAWN_PUSHES, ROOK_LINES, BISHOP_LINES, BETWEEN
 
+# Integer codes cached on every piece so hot loops can compare ints instead of
+# calling isinstance() or comparing PieceColor members.
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+WHITE_SIDE, BLACK_SIDE = 0, 1
 
-class PieceColor(Enum):
+# Algebraic name of every square, indexed [column][row]: SQUARE_NAMES[4][3] == "e4"
+SQUARE_NAMES = [[file + str(row + 1) for row in range(8)] for file in "abcdefgh"]
+
+
+class PieceColor(str, Enum):
     WHITE = "white"
     BLACK = "black"
 
     def __str__(self):
         return self.value
 
+    def opposite(self) -> PieceColor:
+        """Return the other color."""
+        return _OPPOSITE_COLOR[self]
+
+
+_OPPOSITE_COLOR = {PieceColor.WHITE: PieceColor.BLACK, PieceColor.BLACK: PieceColor.WHITE}
+
+
+def _path_is_clear(grid: List[Optional[Piece]], square: int, target: int) -> bool:
+    """Check that no piece stands strictly between two squares on a shared line."""
+    path: int = BETWEEN[square][target]
+    while path:
+        bit = path & -path
+        if grid[bit.bit_length() - 1]:
+            return False
+        path ^= bit
+    return True
+
 
 class Piece:
     """
@@ -32,12 +59,19 @@ class Piece:
         color (PieceColor): Color of the piece (white or black)
         position (str): Position of the piece on the board as a tuple (column, row)
         symbol (str): Character representation of the piece
+        side (int): Integer code of the color (WHITE_SIDE or BLACK_SIDE)
+        piece_type (int): Integer code of the piece type (PAWN ... KING), set per subclass
     """
 
+    __slots__ = ("color", "position", "symbol", "side")
+
+    piece_type: int = -1
+
     def __init__(self, color, position, symbol):
         self.color = color
         self.position = position
         self.symbol = symbol
+        self.side = WHITE_SIDE if color == PieceColor.WHITE else BLACK_SIDE
 
     def is_valid_move(self, current_pos, next_pos, board):
         """Abstract method to check if a move is valid for the piece."""
@@ -49,7 +83,7 @@ class Piece:
 
     def get_algebraic_position(self) -> str:
         """Return the current position of the piece in algebraic notation (e.g., 'e4')."""
-        return str(chr((self.position[0] + 1) + 96)) + str(self.position[1] + 1)
+        return SQUARE_NAMES[self.position[0]][self.position[1]]
 
     def set_position(self, newPos: Tuple[int, int]):
         """Set the position of the piece to a new position."""
@@ -76,38 +110,22 @@ class Pawn(Piece):
         Inherits all attributes from Piece class
     """
 
+    __slots__ = ()
+    piece_type = PAWN
+
     def __init__(self, color, position):
         super().__init__(color, position, "P" if color == PieceColor.WHITE else "p")
 
-    def is_valid_move(self, current_pos: Tuple[int, int], next_pos: Tuple[int, int], grid: List[List[Optional[Piece]]]) -> bool:
+    def is_valid_move(self, current_pos: Tuple[int, int], next_pos: Tuple[int, int], grid: List[Optional[Piece]]) -> bool:
         """Check if the pawn's move is valid based on its current position and the next position."""
-        current_x, current_y = current_pos
-        new_x, new_y = next_pos
-        movement: int = new_y - current_y
-        if current_x == new_x and not grid[new_x][new_y]:  # vertical movement with no piece in the new position
-            if super().get_color() == PieceColor.WHITE:
-                if current_y == 1:  # checks if it's the first move as the pawns can move two squares in first move
-                    if movement > 0 and movement < 3:
-                        return True
-                elif movement == 1:  # regular forward movement (one square only)
-                    return True
-            else:
-                if current_y == 6:  # checks if it's the first move as the pawns can move two squares in first move
-                    if movement > -3 and movement < 0:
-                        return True
-                elif movement == -1:  # regular forward movement (one square only)
-                    return True
-        else:  # diagonal capture logic
-            x_movement: int = new_x - current_x
-            new_piece: Optional[Piece] = grid[new_x][new_y]
-            if (x_movement == -1 or x_movement == 1) and new_piece is not None:  # Checks if there is a piece in diagonal
-                if super().get_color() == PieceColor.WHITE:
-                    if movement == 1 and new_piece.get_color() == PieceColor.BLACK:
-                        return True
-                elif super().get_color() == PieceColor.BLACK:
-                    if movement == -1 and new_piece.get_color() == PieceColor.WHITE:
-                        return True
-        return False
+        square: int = current_pos[0] * 8 + current_pos[1]
+        target: int = next_pos[0] * 8 + next_pos[1]
+        target_piece: Optional[Piece] = grid[target]
+        if target_piece is None:
+            # Straight ahead onto an empty square, without jumping over a piece on a two-square push
+            return bool(PAWN_PUSHES[self.side][square] >> target & 1) and _path_is_clear(grid, square, target)
+        # Diagonally forward onto an enemy piece
+        return target_piece.side != self.side and bool(PAWN_ATTACKS[self.side][square] >> target & 1)
 
 
 class Rook(Piece):
@@ -121,39 +139,20 @@ class Rook(Piece):
         Inherits all attributes from Piece class
     """
 
+    __slots__ = ()
+    piece_type = ROOK
+
     def __init__(self, color, position):
         super().__init__(color, position, "R" if color == PieceColor.WHITE else "r")
 
-    def is_valid_move(self, current_pos: Tuple[int, int], next_pos: Tuple[int, int], grid: List[List[Optional[Piece]]]) -> bool:
+    def is_valid_move(self, current_pos: Tuple[int, int], next_pos: Tuple[int, int], grid: List[Optional[Piece]]) -> bool:
         """Check if the rook's move is valid based on its current position and the next position."""
-        current_x, current_y = current_pos
-        next_x, next_y = next_pos
-        y_movement: int = next_y - current_y
-        x_movement: int = next_x - current_x
-        if grid[next_x][next_y] and grid[next_x][next_y].get_color() == super().get_color():
+        square: int = current_pos[0] * 8 + current_pos[1]
+        target: int = next_pos[0] * 8 + next_pos[1]
+        if grid[target] and grid[target].side == self.side:
             return False  # cannot capture own piece
-
-        if x_movement == 0 and y_movement != 0:  # Check vertical movement (same x, different y)
-            start_y: int = min(current_y, next_y) + 1
-            end_y: int = max(current_y, next_y)
-
-            # Check for pieces in the path (excluding start and end positions)
-            for i in range(start_y, end_y):
-                if grid[current_x][i]:
-                    return False
-            return True
-
-        elif x_movement != 0 and y_movement == 0:  # Check horizontal movement (different x, same y)
-            start_x: int = min(current_x, next_x) + 1
-            end_x: int = max(current_x, next_x)
-
-            # Check for pieces in the path (excluding start and end positions)
-            for i in range(start_x, end_x):
-                if grid[i][current_y]:
-                    return False
-            return True
-
-        return False  # Not a valid rook move (must be either horizontal or vertical)
+        # The target must share a column or row with the rook, with nothing standing in between
+        return bool(ROOK_LINES[square] >> target & 1) and _path_is_clear(grid, square, target)
 
 
 class Knight(Piece):
@@ -168,28 +167,19 @@ class Knight(Piece):
         Inherits all attributes from Piece class
     """
 
+    __slots__ = ()
+    piece_type = KNIGHT
+
     def __init__(self, color, position):
         super().__init__(color, position, "N" if color == PieceColor.WHITE else "n")
 
-    def is_valid_move(self, current_pos: Tuple[int, int], next_pos: Tuple[int, int], grid: List[List[Optional[Piece]]]) -> bool:
+    def is_valid_move(self, current_pos: Tuple[int, int], next_pos: Tuple[int, int], grid: List[Optional[Piece]]) -> bool:
         """Check if the knight's move is valid based on its current position and the next position."""
-        current_x, current_y = current_pos
-        next_x, next_y = next_pos
-        x_movement: int = next_x - current_x
-        y_movement: int = next_y - current_y
-        if grid[next_x][next_y] and grid[next_x][next_y].get_color() == super().get_color():
+        target: int = next_pos[0] * 8 + next_pos[1]
+        if grid[target] and grid[target].side == self.side:
             return False  # cannot capture own piece
-        if x_movement != 0 and y_movement != 0:  # non-orthogonal movement
-            if y_movement > -3 and y_movement < 3 and x_movement > -3 and x_movement < 3:  # check if within L-shape range
-                if (y_movement == 2 or y_movement == -2) and (
-                    x_movement == 1 or x_movement == -1
-                ):  # L-shape: 2 vertical, 1 horizontal
-                    return True
-                if (y_movement == 1 or y_movement == -1) and (
-                    x_movement == 2 or x_movement == -2
-                ):  # L-shape: 1 vertical, 2 horizontal
-                    return True
-        return False
+        # L-shaped jumps from each square are precomputed, so one table bit decides the move
+        return bool(KNIGHT_ATTACKS[current_pos[0] * 8 + current_pos[1]] >> target & 1)
 
 
 class Bishop(Piece):
@@ -203,26 +193,20 @@ class Bishop(Piece):
         Inherits all attributes from Piece class
     """
 
+    __slots__ = ()
+    piece_type = BISHOP
+
     def __init__(self, color, position):
         super().__init__(color, position, "B" if color == PieceColor.WHITE else "b")
 
-    def is_valid_move(self, current_pos: Tuple[int, int], next_pos: Tuple[int, int], grid: List[List[Optional[Piece]]]) -> bool:
-        current_x, current_y = current_pos
-        next_x, next_y = next_pos
-        x_movement: int = next_x - current_x
-        y_movement: int = next_y - current_y
-        if grid[next_x][next_y] and grid[next_x][next_y].get_color() == super().get_color():
+    def is_valid_move(self, current_pos: Tuple[int, int], next_pos: Tuple[int, int], grid: List[Optional[Piece]]) -> bool:
+        """Check if the bishop's move is valid based on its current position and the next position."""
+        square: int = current_pos[0] * 8 + current_pos[1]
+        target: int = next_pos[0] * 8 + next_pos[1]
+        if grid[target] and grid[target].side == self.side:
             return False  # cannot capture own piece
-        if abs(x_movement) == abs(y_movement) and x_movement != 0:  # diagonal movement (like a bishop)
-            dx = 1 if x_movement > 0 else -1
-            dy = 1 if y_movement > 0 else -1
-            x, y = current_x + dx, current_y + dy
-            while x != next_x:
-                if grid[x][y]:
-                    return False
-                x += dx
-                y += dy
-            return True
+        # The target must share a diagonal with the bishop, with nothing standing in between
+        return bool(BISHOP_LINES[square] >> target & 1) and _path_is_clear(grid, square, target)
 
 
 class Queen(Piece):
@@ -236,41 +220,20 @@ class Queen(Piece):
         Inherits all attributes from Piece class
     """
 
+    __slots__ = ()
+    piece_type = QUEEN
+
     def __init__(self, color, position):
         super().__init__(color, position, "Q" if color == PieceColor.WHITE else "q")
 
-    def is_valid_move(self, current_pos: Tuple[int, int], next_pos: Tuple[int, int], grid: List[List[Optional[Piece]]]) -> bool:
-        current_x, current_y = current_pos
-        next_x, next_y = next_pos
-        x_movement: int = next_x - current_x
-        y_movement: int = next_y - current_y
-        if grid[next_x][next_y] and grid[next_x][next_y].get_color() == super().get_color():
+    def is_valid_move(self, current_pos: Tuple[int, int], next_pos: Tuple[int, int], grid: List[Optional[Piece]]) -> bool:
+        """Check if the queen's move is valid based on its current position and the next position."""
+        square: int = current_pos[0] * 8 + current_pos[1]
+        target: int = next_pos[0] * 8 + next_pos[1]
+        if grid[target] and grid[target].side == self.side:
             return False  # cannot capture own piece
-        if x_movement == 0 and y_movement != 0:  # vertical movement (like a rook)
-            start_y: int = min(current_y, next_y) + 1
-            end_y: int = max(current_y, next_y)
-            for i in range(start_y, end_y):  # check path for obstacles
-                if grid[current_x][i]:
-                    return False
-            return True
-        elif x_movement != 0 and y_movement == 0:  # horizontal movement (like a rook)
-            start_x: int = min(current_x, next_x) + 1
-            end_x: int = max(current_x, next_x)
-            for i in range(start_x, end_x):  # check path for obstacles
-                if grid[i][current_y]:
-                    return False
-            return True
-        elif abs(x_movement) == abs(y_movement) and x_movement != 0:  # diagonal movement (like a bishop)
-            dx = 1 if x_movement > 0 else -1
-            dy = 1 if y_movement > 0 else -1
-            x, y = current_x + dx, current_y + dy
-            while x != next_x and y != next_y:
-                if grid[x][y]:
-                    return False
-                x += dx
-                y += dy
-            return True
-        return False
+        # The target must share a line with the queen, like a rook or bishop, with nothing standing in between
+        return bool((ROOK_LINES[square] | BISHOP_LINES[square]) >> target & 1) and _path_is_clear(grid, square, target)
 
 
 class King(Piece):
@@ -284,19 +247,16 @@ class King(Piece):
         Inherits all attributes from Piece class
     """
 
+    __slots__ = ()
+    piece_type = KING
+
     def __init__(self, color, position):
         super().__init__(color, position, "K" if color == PieceColor.WHITE else "k")
 
-    def is_valid_move(self, current_pos: Tuple[int, int], next_pos: Tuple[int, int], grid: List[List[Optional[Piece]]]) -> bool:
+    def is_valid_move(self, current_pos: Tuple[int, int], next_pos: Tuple[int, int], grid: List[Optional[Piece]]) -> bool:
         """Check if the king's move is valid based on its current position and the next position."""
-        current_x, current_y = current_pos
-        next_x, next_y = next_pos
-        x_movement: int = next_x - current_x
-        y_movement: int = next_y - current_y
-        if grid[next_x][next_y] and grid[next_x][next_y].get_color() == super().get_color():
+        target: int = next_pos[0] * 8 + next_pos[1]
+        if grid[target] and grid[target].side == self.side:
             return False  # cannot capture own piece
-        if x_movement != 0 or y_movement != 0:  # ensure some movement is happening
-            if (
-                x_movement > -2 and x_movement < 2 and y_movement > -2 and y_movement < 2
-            ):  # check movement is at most one square in any direction
-                return True
+        # Single steps in any direction from each square are precomputed, so one table bit decides the move
+        return bool(KING_ATTACKS[current_pos[0] * 8 + current_pos[1]] >> target & 1)
@@ -0,0 +1,11 @@
+"""
+wsgi.py - WSGI Entry Point
+
+Exposes the Flask application for production WSGI servers, e.g.:
+
+    gunicorn -w 1 -k gthread --threads 4 wsgi:app
+"""
+
+from app import app
+
+__all__ = ["app"]